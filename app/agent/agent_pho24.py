@@ -1,45 +1,50 @@
 from typing import Dict, List, Optional
+import asyncio
 import logging
 import os
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 from llama_index.llms.openai import OpenAI as OpenAI_LLAMA
 from llama_index.agent.openai import OpenAIAgent
 from llama_index.core import PromptTemplate
 from llama_index.core.memory.chat_memory_buffer import ChatMemoryBuffer
-from llama_index.core.tools import FunctionTool
 
 # Set environment variable for tiktoken to use /tmp which is writable in Vercel
 os.environ["TIKTOKEN_CACHE_DIR"] = "/tmp/tiktoken_cache"
 
 from app.templates.prompt_templates import PHO24_SYSTEM_TEMPLATE
-from app.tools.search.pho24_semantic_search_tool import Pho24SemanticSearchTool
+from app.tools.tool_registry import ToolRegistry
 from app.config.env_config import config
 
  
 class AgentPHO24:
     """
     PHO24 agent for answering queries about the brand.
-    This agent uses semantic search to provide accurate information about PHO24.
+    This agent uses the tools discovered by the ToolRegistry (such as semantic search)
+    to provide accurate information about PHO24.
     """
     
+    # Maximum tool-calling rounds per query (the OpenAIAgent default)
+    MAX_FUNCTION_CALLS = 5
+    
     def __init__(self):
+        self.logger = logging.getLogger(__name__)
         self.qa_template = PromptTemplate(PHO24_SYSTEM_TEMPLATE)
         self.gpt4_llm = OpenAI_LLAMA(model=config.llm_model)
         self.agent = None
+        self.tool_registry = ToolRegistry()
+        # Long-lived event loop for the async agent, which runs parallel tool calls concurrently
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="agent-loop", daemon=True).start()
         self._setup_agent()
-        self.logger = logging.getLogger(__name__)
     
     def _setup_agent(self):
         """Set up the agent with necessary tools."""
-        # Create semantic search tool
-        pho24_semantic_search_tool = Pho24SemanticSearchTool()
-        
-        # Create llama_index FunctionTool object
-        pho24_semantic_search_function_tool = FunctionTool.from_defaults(
-            name=pho24_semantic_search_tool.name,
-            description=pho24_semantic_search_tool.description,
-            fn=pho24_semantic_search_tool.__call__
-        )
+        # Discover tools and wrap them as llama_index FunctionTool objects
+        self.tool_registry.load_tools()
+        function_tools = self.tool_registry.get_function_tools()
+        self.query_timeout = config.agent_query_timeout_seconds or self._derive_query_timeout()
         
         try:
             # Set up memory with configurable token limit
@@ -52,13 +57,29 @@ class AgentPHO24:
         
         # Initialize agent with tools
         self.agent = OpenAIAgent.from_tools(
-            tools=[pho24_semantic_search_function_tool],
+            tools=function_tools,
             llm=self.gpt4_llm,
             memory=memory,
+            max_function_calls=self.MAX_FUNCTION_CALLS,
             verbose=True,
             system_prompt=PHO24_SYSTEM_TEMPLATE
         )
     
+    def _derive_query_timeout(self) -> float:
+        """
+        Derive the worst-case duration of one query.
+        
+        Each tool round is followed by an LLM call, plus the first call that picks tools,
+        and every LLM call may be retried max_retries times.
+        
+        Returns:
+            Timeout in seconds.
+        """
+        llm_calls = self.MAX_FUNCTION_CALLS + 1
+        llm_seconds = llm_calls * self.gpt4_llm.timeout * (self.gpt4_llm.max_retries + 1)
+        tool_seconds = self.MAX_FUNCTION_CALLS * self.tool_registry.total_timeout()
+        return llm_seconds + tool_seconds
+    
     def agent_query(self, query: str) -> str:
         """
         Query the agent with a user question.
@@ -70,7 +91,13 @@ class AgentPHO24:
             The agent's response.
         """
         try:
-            response = self.agent.chat(query)
+            # achat executes the tool calls of one turn concurrently; chat would run them one by one
+            future = asyncio.run_coroutine_threadsafe(self.agent.achat(query), self._loop)
+            try:
+                response = future.result(timeout=self.query_timeout)
+            except FutureTimeoutError:
+                future.cancel()
+                raise TimeoutError(f"Agent did not answer within {self.query_timeout}s")
             return str(response)
         except Exception as e:
             self.logger.error(f"Error querying agent: {e}")
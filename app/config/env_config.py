@@ -37,6 +37,34 @@ class Config:
         except ValueError:
             self.memory_token_limit = 10000
         
+        # Tool execution settings
+        try:
+            self.tool_timeout_seconds = float(os.environ.get('TOOL_TIMEOUT_SECONDS', '15'))
+        except ValueError:
+            self.tool_timeout_seconds = 15.0
+        try:
+            self.tool_max_workers = int(os.environ.get('TOOL_MAX_WORKERS', '16'))
+        except ValueError:
+            self.tool_max_workers = 16
+        try:
+            self.tool_max_concurrency = int(os.environ.get('TOOL_MAX_CONCURRENCY', '4'))
+        except ValueError:
+            self.tool_max_concurrency = 4
+        # Upper bound for one agent query; None derives it from the LLM and tool timeouts
+        try:
+            agent_query_timeout = os.environ.get('AGENT_QUERY_TIMEOUT_SECONDS', '')
+            self.agent_query_timeout_seconds = float(agent_query_timeout) if agent_query_timeout else None
+        except ValueError:
+            self.agent_query_timeout_seconds = None
+        try:
+            self.tool_cache_size = int(os.environ.get('TOOL_CACHE_SIZE', '256'))
+        except ValueError:
+            self.tool_cache_size = 256
+        try:
+            self.tool_cache_ttl_seconds = float(os.environ.get('TOOL_CACHE_TTL_SECONDS', '300'))
+        except ValueError:
+            self.tool_cache_ttl_seconds = 300.0
+        
         # Validate critical configuration
         self._validate_config()
     
@@ -0,0 +1,184 @@
+import json
+import logging
+import math
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Type
+
+from app.services.embeddings import EmbeddingService
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotVectorIndex:
+    """In-memory cosine similarity index over the chunks stored in an embedding snapshot."""
+
+    def __init__(self, chunks: List[Dict[str, Any]]):
+        """
+        Initialize the index.
+
+        Args:
+            chunks: Snapshot chunks with 'id', 'text' and 'embedding' fields.
+        """
+        self.chunks = []
+        for chunk in chunks:
+            embedding = chunk.get("embedding")
+            # pgvector columns come back from Supabase as strings like "[0.1,0.2]"
+            if isinstance(embedding, str):
+                embedding = json.loads(embedding)
+            if not embedding:
+                logger.warning(f"Skipping snapshot chunk without embedding: {chunk.get('id')}")
+                continue
+            self.chunks.append((chunk, embedding, self._norm(embedding)))
+
+    @staticmethod
+    def _norm(vector: List[float]) -> float:
+        return math.sqrt(sum(value * value for value in vector)) or 1.0
+
+    def search(self, query_embedding: List[float], match_count: int = 5,
+               match_threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Return the chunks most similar to the query embedding.
+
+        Args:
+            query_embedding: The embedding for the query.
+            match_count: Maximum number of results to return.
+            match_threshold: Optional minimum cosine similarity.
+
+        Returns:
+            Matching rows shaped like the Supabase RPC results, best match first.
+        """
+        query_norm = self._norm(query_embedding)
+        scored = []
+        for chunk, embedding, norm in self.chunks:
+            similarity = sum(q * c for q, c in zip(query_embedding, embedding)) / (query_norm * norm)
+            if match_threshold is None or similarity >= match_threshold:
+                scored.append((similarity, chunk))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [
+            {
+                "id": chunk.get("id"),
+                "text": chunk.get("text", ""),
+                "content": chunk.get("text", ""),
+                "metadata": chunk.get("metadata", {}),
+                "similarity": similarity,
+            }
+            for similarity, chunk in scored[:match_count]
+        ]
+
+
+class _SnapshotRpcResponse:
+    def __init__(self, data: List[Dict[str, Any]]):
+        self.data = data
+
+
+class _SnapshotRpcCall:
+    def __init__(self, index: SnapshotVectorIndex, params: Dict[str, Any]):
+        self.index = index
+        self.params = params
+
+    def execute(self) -> _SnapshotRpcResponse:
+        return _SnapshotRpcResponse(self.index.search(
+            self.params["query_embedding"],
+            match_count=self.params.get("match_count", 5),
+            match_threshold=self.params.get("match_threshold"),
+        ))
+
+
+class SnapshotRpcClient:
+    """
+    Offline stand-in for the Supabase client used by the retrieval code.
+
+    Serves each vector search RPC ('semantic_search_pho24', 'match_documents')
+    from the SnapshotVectorIndex recorded for it, so the real tools can be
+    evaluated without network access.
+    """
+
+    def __init__(self, indexes: Dict[str, SnapshotVectorIndex]):
+        """
+        Initialize the client.
+
+        Args:
+            indexes: Snapshot indexes keyed by the RPC name they answer.
+        """
+        self.indexes = indexes
+
+    def rpc(self, fn: str, params: Dict[str, Any]) -> _SnapshotRpcCall:
+        if fn not in self.indexes:
+            raise ValueError(f"No snapshot chunks recorded for RPC '{fn}'")
+        return _SnapshotRpcCall(self.indexes[fn], params)
+
+
+class RetrievalBackend(ABC):
+    """Abstract base class for retrieval backends that can be evaluated."""
+
+    # Supabase RPC the backend searches through; snapshot chunks are recorded per RPC
+    rpc_name: str = ""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @abstractmethod
+    def retrieve(self, query: str, k: int) -> List[Dict[str, Any]]:
+        """
+        Retrieve the top chunks for a query.
+
+        Args:
+            query: The question to retrieve chunks for.
+            k: Number of chunks to retrieve.
+
+        Returns:
+            Retrieved chunk rows, best match first. Each row has at least 'id' and 'text'.
+        """
+        pass
+
+
+class SemanticSearchToolBackend(RetrievalBackend):
+    """Evaluates Pho24SemanticSearchTool through its 'semantic_search_pho24' RPC."""
+
+    rpc_name = "semantic_search_pho24"
+
+    def __init__(self, embedding_service: EmbeddingService, supabase=None,
+                 match_threshold: Optional[float] = None):
+        super().__init__("pho24_semantic_search")
+        from app.tools.search.pho24_semantic_search_tool import Pho24SemanticSearchTool
+        self.tool = Pho24SemanticSearchTool(embedding_service=embedding_service, supabase=supabase)
+        self.match_threshold = match_threshold
+
+    def retrieve(self, query: str, k: int) -> List[Dict[str, Any]]:
+        results = self.tool.search(query, match_count=k, match_threshold=self.match_threshold)
+        if results is None:
+            raise RuntimeError("Failed to generate embedding for query")
+        return results
+
+
+class SupabaseVectorStoreBackend(RetrievalBackend):
+    """Evaluates SupabaseVectorStore.similarity_search through its 'match_documents' RPC."""
+
+    rpc_name = "match_documents"
+
+    def __init__(self, embedding_service: EmbeddingService, supabase=None,
+                 match_threshold: Optional[float] = None):
+        super().__init__("supabase_vectorstore")
+        from app.vectorstore.supabase_vectorstore import SupabaseVectorStore
+        self.embedding_service = embedding_service
+        self.store = SupabaseVectorStore(client=supabase)
+        self.match_threshold = match_threshold
+
+    def retrieve(self, query: str, k: int) -> List[Dict[str, Any]]:
+        query_embedding = self.embedding_service.get_embedding(query)
+        if not query_embedding:
+            raise RuntimeError("Failed to generate embedding for query")
+        # raise_errors so RPC failures are reported as query errors, not as empty results
+        search_kwargs = {"match_threshold": self.match_threshold} if self.match_threshold is not None else {}
+        results = self.store.similarity_search(query_embedding, limit=k, raise_errors=True, **search_kwargs) or []
+        # match_documents returns 'content'; normalise to the 'text' field used elsewhere
+        return [dict(row, text=row.get("text") or row.get("content", "")) for row in results]
+
+
+# Backend classes keyed by name, each constructed with (embedding_service, supabase_client, match_threshold=None);
+# a None threshold keeps the backend's production default
+RETRIEVAL_BACKENDS: Dict[str, Type[RetrievalBackend]] = {
+    "pho24_semantic_search": SemanticSearchToolBackend,
+    "supabase_vectorstore": SupabaseVectorStoreBackend,
+}
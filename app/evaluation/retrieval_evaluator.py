@@ -0,0 +1,231 @@
+import json
+import logging
+import math
+import os
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from app.evaluation.retrieval_backends import RetrievalBackend
+
+logger = logging.getLogger(__name__)
+
+
+def load_golden_set(path: str) -> List[Dict[str, Any]]:
+    """
+    Load a golden question set.
+
+    The file is a JSON list of objects with 'id', 'question', 'expected_chunk_ids'
+    and an optional 'language' ('en' or 'vi').
+
+    Args:
+        path: Path to the golden set JSON file.
+
+    Returns:
+        List of golden questions.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        golden_set = json.load(f)
+
+    for index, item in enumerate(golden_set):
+        if not item.get("question") or not item.get("expected_chunk_ids"):
+            raise ValueError(f"Golden set entry {index} needs 'question' and 'expected_chunk_ids'")
+        item.setdefault("id", f"q{index + 1:03d}")
+        item.setdefault("language", "unknown")
+    return golden_set
+
+
+def get_token_counter(model: str) -> Callable[[str], int]:
+    """
+    Build a token counter for the given LLM model.
+
+    Falls back to whitespace tokenisation if tiktoken is not available or its
+    encoding cannot be loaded (tiktoken downloads encodings on first use, which fails offline).
+
+    Args:
+        model: The LLM model name used to pick the tiktoken encoding.
+
+    Returns:
+        A function returning the number of tokens in a string.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken not installed, counting whitespace-separated tokens instead")
+        return lambda text: len(text.split())
+
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Could not load tiktoken encoding ({e}), counting whitespace-separated tokens instead")
+        return lambda text: len(text.split())
+    return lambda text: len(encoding.encode(text))
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(0, math.ceil(percentile / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+class RetrievalEvaluator:
+    """Runs a golden question set against retrieval backends and computes quality and latency metrics."""
+
+    def __init__(self, golden_set: List[Dict[str, Any]], ks: List[int],
+                 count_tokens: Callable[[str], int]):
+        """
+        Initialize the evaluator.
+
+        Args:
+            golden_set: Golden questions as returned by load_golden_set.
+            ks: Cut-offs to report recall@k for. Retrieval runs at max(ks).
+            count_tokens: Function counting the tokens of a context string.
+        """
+        self.golden_set = golden_set
+        self.ks = sorted(set(ks))
+        self.count_tokens = count_tokens
+
+    def evaluate_query(self, backend: RetrievalBackend, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Evaluate a single golden question against a backend.
+
+        Args:
+            backend: The retrieval backend.
+            item: The golden question.
+
+        Returns:
+            Per-query result with retrieved ids, recall@k, reciprocal rank,
+            context tokens and latency.
+        """
+        expected = [str(chunk_id) for chunk_id in item["expected_chunk_ids"]]
+        error = None
+
+        start = time.perf_counter()
+        try:
+            results = backend.retrieve(item["question"], max(self.ks))
+        except Exception as e:
+            logger.error(f"Error retrieving with {backend.name} for {item['id']}: {e}")
+            results = []
+            error = str(e)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        retrieved = [str(row.get("id")) for row in results]
+        # The tool joins chunk texts the same way when building the agent's context
+        context = "\n\n".join(row.get("text", "") for row in results)
+
+        first_hit = next((rank for rank, chunk_id in enumerate(retrieved, 1) if chunk_id in expected), None)
+
+        return {
+            "id": item["id"],
+            "language": item["language"],
+            "question": item["question"],
+            "expected_chunk_ids": expected,
+            "retrieved_chunk_ids": retrieved,
+            "recall": {
+                str(k): len(set(retrieved[:k]) & set(expected)) / len(expected)
+                for k in self.ks
+            },
+            "reciprocal_rank": 1 / first_hit if first_hit else 0.0,
+            "context_tokens": self.count_tokens(context),
+            "latency_ms": round(latency_ms, 3),
+            "error": error,
+        }
+
+    def summarize(self, query_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Aggregate per-query results into summary metrics.
+
+        Args:
+            query_results: Results from evaluate_query.
+
+        Returns:
+            Mean recall@k, MRR, context token and latency statistics.
+        """
+        if not query_results:
+            return {"queries": 0}
+
+        latencies = [result["latency_ms"] for result in query_results]
+        tokens = [result["context_tokens"] for result in query_results]
+        return {
+            "queries": len(query_results),
+            "errors": sum(1 for result in query_results if result["error"]),
+            "recall": {
+                str(k): round(statistics.mean(result["recall"][str(k)] for result in query_results), 4)
+                for k in self.ks
+            },
+            "mrr": round(statistics.mean(result["reciprocal_rank"] for result in query_results), 4),
+            "context_tokens": {
+                "mean": round(statistics.mean(tokens), 1),
+                "max": max(tokens),
+            },
+            "latency_ms": {
+                "mean": round(statistics.mean(latencies), 3),
+                "p50": round(_percentile(latencies, 50), 3),
+                "p95": round(_percentile(latencies, 95), 3),
+                "max": round(max(latencies), 3),
+            },
+        }
+
+    def evaluate_backend(self, backend: RetrievalBackend) -> Dict[str, Any]:
+        """
+        Evaluate every golden question against a backend.
+
+        Args:
+            backend: The retrieval backend.
+
+        Returns:
+            Overall summary, per-language summaries and per-query results.
+        """
+        logger.info(f"Evaluating {backend.name} on {len(self.golden_set)} questions")
+        query_results = [self.evaluate_query(backend, item) for item in self.golden_set]
+
+        languages = sorted({result["language"] for result in query_results})
+        return {
+            "summary": self.summarize(query_results),
+            "by_language": {
+                language: self.summarize([r for r in query_results if r["language"] == language])
+                for language in languages
+            },
+            "queries": query_results,
+        }
+
+    def run(self, backends: List[RetrievalBackend], run_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Evaluate all backends.
+
+        Args:
+            backends: The retrieval backends to evaluate.
+            run_info: Extra settings to record with the results (model, snapshot, ...).
+
+        Returns:
+            Machine-readable evaluation results.
+        """
+        return {
+            "run": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "ks": self.ks,
+                **(run_info or {}),
+            },
+            "backends": {backend.name: self.evaluate_backend(backend) for backend in backends},
+        }
+
+
+def write_results(results: Dict[str, Any], path: str) -> None:
+    """
+    Write evaluation results as stable, diff-friendly JSON.
+
+    Args:
+        results: Results returned by RetrievalEvaluator.run.
+        path: Output file path.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
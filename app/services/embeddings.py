@@ -1,7 +1,12 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import json
+import logging
+import os
 import openai
 from app.config.env_config import config
 
+logger = logging.getLogger(__name__)
+
 class EmbeddingService:
     """Service for generating embeddings using OpenAI."""
     
@@ -63,4 +68,91 @@ class EmbeddingService:
             except Exception as e:
                 print(f"Error processing document for embedding: {e}")
                 
-        return enriched_documents 
\ No newline at end of file
+        return enriched_documents 
+
+
+class CachedEmbeddingService(EmbeddingService):
+    """
+    Embedding service backed by an on-disk embedding snapshot.
+    
+    The snapshot is a JSON file of the form
+    {"model": "<embedding model>", "queries": {"<text>": [...]}, "chunks": {"<rpc name>": [...]}},
+    where chunks are stored per search RPC so each retrieval backend keeps its own corpus.
+    Cached embeddings are served from the snapshot; in offline mode a cache miss
+    returns an empty list instead of calling the OpenAI API.
+    """
+    
+    def __init__(self, snapshot_path: str, offline: bool = True, model: Optional[str] = None):
+        """
+        Initialize the cached embedding service.
+        
+        Args:
+            snapshot_path: Path to the embedding snapshot JSON file.
+            offline: If True, never call the OpenAI API.
+            model: Embedding model name. Defaults to the snapshot's model, then the configured model.
+        """
+        super().__init__()
+        self.snapshot_path = snapshot_path
+        self.offline = offline
+        self.snapshot = self._load_snapshot(snapshot_path)
+        self.model = model or self.snapshot.get("model") or self.model
+        
+        if self.snapshot.get("model") and self.snapshot["model"] != self.model:
+            raise ValueError(
+                f"Snapshot {snapshot_path} was built with {self.snapshot['model']}, not {self.model}"
+            )
+        self.snapshot["model"] = self.model
+        self.snapshot.setdefault("queries", {})
+        self.snapshot.setdefault("chunks", {})
+        self.misses = 0
+    
+    @staticmethod
+    def _load_snapshot(snapshot_path: str) -> Dict[str, Any]:
+        """Load the snapshot file, returning an empty snapshot if it does not exist yet."""
+        if not os.path.exists(snapshot_path):
+            return {}
+        with open(snapshot_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    
+    def get_embedding(self, text: str) -> List[float]:
+        """
+        Return the cached embedding for the given text, fetching it when online.
+        
+        Args:
+            text: The text to generate an embedding for.
+            
+        Returns:
+            A list of floats representing the embedding, or an empty list
+            if the text is not cached and the service is offline.
+        """
+        cached = self.snapshot["queries"].get(text)
+        if cached:
+            return cached
+        
+        self.misses += 1
+        if self.offline:
+            logger.warning(f"Embedding not found in snapshot (offline): {text}")
+            return []
+        
+        embedding = super().get_embedding(text)
+        if embedding:
+            self.snapshot["queries"][text] = embedding
+        return embedding
+    
+    def save(self, snapshot_path: Optional[str] = None) -> str:
+        """
+        Write the snapshot, including any embeddings fetched while online.
+        
+        Args:
+            snapshot_path: Optional output path. Defaults to the path the snapshot was loaded from.
+            
+        Returns:
+            The path the snapshot was written to.
+        """
+        path = snapshot_path or self.snapshot_path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot, f, ensure_ascii=False)
+        return path
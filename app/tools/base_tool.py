@@ -5,16 +5,35 @@ from typing import Dict, Any, Optional
 class BaseTool(ABC):
     """Abstract base class for all tools."""
     
-    def __init__(self, name: str, description: str):
+    def __init__(self, name: str, description: str, timeout: Optional[float] = None,
+                 max_concurrency: Optional[int] = None):
         """
         Initialize the tool.
         
         Args:
             name: Name of the tool.
             description: Description of what the tool does.
+            timeout: Optional timeout in seconds for one call. Defaults to config.tool_timeout_seconds.
+            max_concurrency: Optional cap on calls of this tool in flight at once. Defaults to config.tool_max_concurrency.
         """
         self.name = name
         self.description = description
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+    
+    def is_cacheable(self, result: str) -> bool:
+        """
+        Decide whether a result may be cached for identical arguments.
+        
+        Override to keep transient failures (e.g. fallback error messages) out of the cache.
+        
+        Args:
+            result: The result returned by the tool.
+            
+        Returns:
+            True if the result can be reused.
+        """
+        return True
     
     @abstractmethod
     def __call__(self, *args, **kwargs) -> str:
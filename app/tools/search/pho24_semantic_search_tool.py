@@ -1,5 +1,5 @@
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.tools.base_tool import BaseTool
 from app.services.embeddings import EmbeddingService
 from app.config.env_config import config
@@ -10,13 +10,59 @@ logger = logging.getLogger(__name__)
 class Pho24SemanticSearchTool(BaseTool):
     """Tool for semantically searching Pho24 information using Supabase vector search."""
     
-    def __init__(self):
+    EMBEDDING_ERROR_RESPONSE = "I'm sorry, I'm having trouble processing your question. Please try asking in a different way."
+    SEARCH_ERROR_RESPONSE = "I apologize, but I'm having trouble accessing information about PHO24 at the moment. Please try again later."
+    
+    def __init__(self, embedding_service: Optional[EmbeddingService] = None, supabase=None):
+        """
+        Initialize the search tool.
+        
+        Args:
+            embedding_service: Optional embedding service to use instead of creating a new one.
+            supabase: Optional Supabase client (or any client exposing the same rpc interface).
+        """
         super().__init__(
             name="Pho24SemanticSearch",
             description="Search for information about Pho24 using semantic search. This tool is useful for answering questions about the restaurant, menu items, locations, and other information about Pho24."
         )
-        self.embedding_service = EmbeddingService()
-        self.supabase = get_supabase_client()
+        self.embedding_service = embedding_service or EmbeddingService()
+        self.supabase = supabase if supabase is not None else get_supabase_client()
+    
+    def search(self, query: str, match_count: int = 5,
+               match_threshold: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Run the semantic search and return the raw matching chunks.
+        
+        Args:
+            query: The user's question about Pho24
+            match_count: Number of results to return (default: 5)
+            match_threshold: Optional minimum similarity, passed to the RPC only when set
+            
+        Returns:
+            List of matching chunk rows as returned by Supabase,
+            or None if the query embedding could not be generated.
+        """
+        # Generate embedding for the query
+        logger.info(f"Generating embedding for query: {query}")
+        query_embedding = self.embedding_service.get_embedding(query)
+        
+        if not query_embedding:
+            logger.error("Failed to generate embedding for query")
+            return None
+        
+        # Call the Supabase RPC function for semantic search
+        logger.info(f"Calling semantic_search_pho24 with match_count={match_count}")
+        params = {
+            'query_embedding': query_embedding,
+            'match_count': match_count
+        }
+        if match_threshold is not None:
+            params['match_threshold'] = match_threshold
+        response = self.supabase.rpc('semantic_search_pho24', params).execute()
+        
+        if not hasattr(response, 'data') or not response.data:
+            return []
+        return response.data
     
     def __call__(self, query: str, match_count: int = 5) -> str:
         """
@@ -30,30 +76,16 @@ class Pho24SemanticSearchTool(BaseTool):
             Relevant information from the Pho24 knowledge base
         """
         try:
-            # Generate embedding for the query
-            logger.info(f"Generating embedding for query: {query}")
-            query_embedding = self.embedding_service.get_embedding(query)
+            results = self.search(query, match_count)
             
-            if not query_embedding:
-                logger.error("Failed to generate embedding for query")
-                return "I'm sorry, I'm having trouble processing your question. Please try asking in a different way."
-            
-            # Call the Supabase RPC function for semantic search
-            logger.info(f"Calling semantic_search_pho24 with match_count={match_count}")
-            response = self.supabase.rpc(
-                'semantic_search_pho24',
-                {
-                    'query_embedding': query_embedding,
-                    'match_count': match_count
-                }
-            ).execute()
+            if results is None:
+                return self.EMBEDDING_ERROR_RESPONSE
             
             # Process and format the results
-            if not hasattr(response, 'data') or not response.data:
+            if not results:
                 logger.warning("No results found from semantic search")
                 return "I don't have specific information about that. Is there something else about PHO24 I can help you with?"
             
-            results = response.data
             logger.info(f"Found {len(results)} matching documents")
             
             # Format the results into a readable response
@@ -69,4 +101,8 @@ class Pho24SemanticSearchTool(BaseTool):
             logger.error(f"Error in semantic search: {e}")
             import traceback
             logger.error(traceback.format_exc())
-            return "I apologize, but I'm having trouble accessing information about PHO24 at the moment. Please try again later." 
\ No newline at end of file
+            return self.SEARCH_ERROR_RESPONSE
+    
+    def is_cacheable(self, result: str) -> bool:
+        """Do not cache fallback messages caused by embedding or Supabase failures."""
+        return result not in (self.EMBEDDING_ERROR_RESPONSE, self.SEARCH_ERROR_RESPONSE) 
\ No newline at end of file
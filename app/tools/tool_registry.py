@@ -0,0 +1,380 @@
+import asyncio
+import functools
+import importlib
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from llama_index.core.tools import FunctionTool
+
+from app.tools.base_tool import BaseTool
+from app.config.env_config import config
+
+logger = logging.getLogger(__name__)
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class ToolRegistry:
+    """
+    Registry that discovers BaseTool subclasses and runs them for the agent.
+
+    Tools share one instance of each client (embedding service, Supabase client).
+    Each call runs in a worker thread with a per-tool timeout, so tool calls
+    awaited together by the agent execute concurrently. A timed-out call keeps
+    its worker until it returns, so each tool is capped on in-flight calls and
+    a hanging backend cannot take the workers other tools need. Results are
+    cached by tool name and arguments.
+    """
+
+    def __init__(self, client_factories: Optional[Dict[str, Callable[[], Any]]] = None,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            client_factories: Factories for shared clients, keyed by the constructor
+                argument name tools use to receive them. Defaults to 'embedding_service' and 'supabase'.
+            max_workers: Size of the worker pool shared by all tools. Defaults to config.tool_max_workers.
+        """
+        self._client_factories = (
+            client_factories if client_factories is not None else self._default_client_factories()
+        )
+        self._clients: Dict[str, Any] = {}
+        self._tools: Dict[str, BaseTool] = {}
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._max_workers = max_workers or config.tool_max_workers
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="tool")
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _default_client_factories() -> Dict[str, Callable[[], Any]]:
+        from app.services.embeddings import EmbeddingService
+        from app.config.supabase_config import get_supabase_client
+        return {
+            "embedding_service": EmbeddingService,
+            "supabase": get_supabase_client,
+        }
+
+    def get_client(self, name: str) -> Any:
+        """
+        Return the shared client with the given name, creating it on first use.
+
+        Args:
+            name: The client name, e.g. 'embedding_service' or 'supabase'.
+
+        Returns:
+            The shared client instance.
+        """
+        with self._lock:
+            if name not in self._clients:
+                self._clients[name] = self._client_factories[name]()
+            return self._clients[name]
+
+    @staticmethod
+    def discover() -> List[Type[BaseTool]]:
+        """
+        Import every module under app/tools and collect the concrete BaseTool subclasses defined there.
+
+        Returns:
+            Tool classes in a stable order.
+        """
+        for root, _, files in os.walk(TOOLS_DIR):
+            for file_name in sorted(files):
+                if (not file_name.endswith(".py") or file_name.startswith("__")
+                        or file_name in ("base_tool.py", "tool_registry.py")):
+                    continue
+                relative = os.path.relpath(os.path.join(root, file_name[:-3]), TOOLS_DIR)
+                module_name = "app.tools." + relative.replace(os.sep, ".")
+                try:
+                    importlib.import_module(module_name)
+                except Exception as e:
+                    logger.error(f"Error importing tool module {module_name}: {e}")
+
+        tool_classes = []
+        pending = list(BaseTool.__subclasses__())
+        while pending:
+            tool_class = pending.pop(0)
+            pending.extend(tool_class.__subclasses__())
+            # Only tools defined under app/tools, not subclasses loaded from elsewhere (e.g. tests)
+            if (not inspect.isabstract(tool_class) and tool_class.__module__.startswith("app.tools.")
+                    and tool_class not in tool_classes):
+                tool_classes.append(tool_class)
+        return sorted(tool_classes, key=lambda cls: (cls.__module__, cls.__name__))
+
+    def register(self, tool: BaseTool) -> BaseTool:
+        """
+        Register a tool instance.
+
+        Args:
+            tool: The tool to register.
+
+        Returns:
+            The registered tool.
+        """
+        if tool.name in self._tools:
+            raise ValueError(f"A tool named {tool.name} is already registered")
+        self._tools[tool.name] = tool
+        self._semaphores[tool.name] = threading.BoundedSemaphore(self._max_concurrency_for(tool))
+
+        reserved = sum(self._max_concurrency_for(registered) for registered in self._tools.values())
+        if reserved > self._max_workers:
+            logger.warning(
+                f"Tools may hold {reserved} calls in flight but the pool has {self._max_workers} workers; "
+                f"raise TOOL_MAX_WORKERS so a hanging tool cannot delay the others"
+            )
+        return tool
+
+    def create_tool(self, tool_class: Type[BaseTool]) -> BaseTool:
+        """
+        Instantiate a tool, passing the shared clients its constructor accepts.
+
+        Args:
+            tool_class: The BaseTool subclass to instantiate.
+
+        Returns:
+            The tool instance.
+        """
+        parameters = inspect.signature(tool_class.__init__).parameters
+        clients = {name: self.get_client(name) for name in self._client_factories if name in parameters}
+        return tool_class(**clients)
+
+    def load_tools(self) -> List[BaseTool]:
+        """
+        Discover, instantiate and register all tools.
+
+        Returns:
+            The registered tools.
+        """
+        for tool_class in self.discover():
+            try:
+                self.register(self.create_tool(tool_class))
+                logger.info(f"Registered tool {tool_class.__name__}")
+            except Exception as e:
+                logger.error(f"Error registering tool {tool_class.__name__}: {e}")
+        return list(self._tools.values())
+
+    @property
+    def tools(self) -> List[BaseTool]:
+        """The registered tools."""
+        return list(self._tools.values())
+
+    def total_timeout(self) -> float:
+        """
+        Upper bound in seconds for running every registered tool once.
+
+        Each call may wait up to its timeout for a worker and then run up to its timeout.
+        """
+        return sum(2 * self._timeout_for(tool) for tool in self._tools.values())
+
+    def _cache_key(self, tool: BaseTool, args: tuple, kwargs: dict) -> Tuple[str, str]:
+        """Build a cache key from the tool name and its arguments with defaults applied."""
+        bound = inspect.signature(tool.__call__).bind(*args, **kwargs)
+        bound.apply_defaults()
+        return tool.name, json.dumps(bound.arguments, sort_keys=True, default=str)
+
+    def _get_cached(self, key: Tuple[str, str]) -> Optional[str]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.monotonic() - stored_at > config.tool_cache_ttl_seconds:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return result
+
+    def _set_cached(self, key: Tuple[str, str], tool: BaseTool, result: str):
+        if config.tool_cache_size <= 0 or not tool.is_cacheable(result):
+            return
+        with self._lock:
+            self._cache[key] = (time.monotonic(), result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > config.tool_cache_size:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        """Drop all cached tool results."""
+        with self._lock:
+            self._cache.clear()
+
+    def _timeout_for(self, tool: BaseTool) -> float:
+        return tool.timeout if tool.timeout is not None else config.tool_timeout_seconds
+
+    def _max_concurrency_for(self, tool: BaseTool) -> int:
+        return tool.max_concurrency if tool.max_concurrency is not None else config.tool_max_concurrency
+
+    def _timeout_response(self, tool: BaseTool) -> str:
+        logger.warning(f"Tool {tool.name} timed out after {self._timeout_for(tool)}s")
+        return f"The {tool.name} tool took too long to respond. Please answer with the information already available."
+
+    def _busy_response(self, tool: BaseTool) -> str:
+        logger.warning(f"Tool {tool.name} has too many calls in flight or no free worker")
+        return f"The {tool.name} tool is busy right now. Please answer with the information already available."
+
+    def _error_response(self, tool: BaseTool, error: Exception) -> str:
+        logger.error(f"Error running tool {tool.name}: {error}")
+        return f"The {tool.name} tool is currently unavailable."
+
+    def _submit(self, tool: BaseTool, call: Callable[[], str],
+                on_start: Callable[[], None]) -> Optional[Future]:
+        """
+        Submit a tool call to the worker pool if the tool is under its concurrency cap.
+
+        The tool's slot is held until the call actually finishes (or is cancelled
+        before starting), not until the caller stops waiting.
+
+        Args:
+            tool: The tool being called.
+            call: The call to run.
+            on_start: Called from the worker thread when the call starts running.
+
+        Returns:
+            The future for the call, or None if the tool already has too many calls in flight.
+        """
+        semaphore = self._semaphores[tool.name]
+        if not semaphore.acquire(blocking=False):
+            return None
+
+        def task() -> str:
+            on_start()
+            return call()
+
+        try:
+            future = self._executor.submit(task)
+        except Exception:
+            semaphore.release()
+            raise
+        future.add_done_callback(lambda _: semaphore.release())
+        return future
+
+    def run(self, name: str, *args, **kwargs) -> str:
+        """
+        Run a tool synchronously, using the cache and the tool's timeout.
+
+        The timeout is counted from when the call starts running; waiting for a
+        free worker is bounded separately by the same timeout.
+
+        Args:
+            name: The registered tool name.
+
+        Returns:
+            The tool result, or a fallback message if it was busy, timed out or failed.
+        """
+        tool = self._tools[name]
+        key = self._cache_key(tool, args, kwargs)
+        cached = self._get_cached(key)
+        if cached is not None:
+            logger.info(f"Tool cache hit for {name}")
+            return cached
+
+        timeout = self._timeout_for(tool)
+        started = threading.Event()
+        future = self._submit(tool, functools.partial(tool, *args, **kwargs), started.set)
+        if future is None:
+            return self._busy_response(tool)
+        # cancel() only succeeds while the call is still queued
+        if not started.wait(timeout) and future.cancel():
+            return self._busy_response(tool)
+        started.wait()
+
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            return self._timeout_response(tool)
+        except Exception as e:
+            return self._error_response(tool, e)
+
+        self._set_cached(key, tool, result)
+        return result
+
+    async def arun(self, name: str, *args, **kwargs) -> str:
+        """
+        Run a tool without blocking the event loop, so that several calls can be awaited concurrently.
+
+        The timeout is counted from when the call starts running; waiting for a
+        free worker is bounded separately by the same timeout.
+
+        Args:
+            name: The registered tool name.
+
+        Returns:
+            The tool result, or a fallback message if it was busy, timed out or failed.
+        """
+        tool = self._tools[name]
+        key = self._cache_key(tool, args, kwargs)
+        cached = self._get_cached(key)
+        if cached is not None:
+            logger.info(f"Tool cache hit for {name}")
+            return cached
+
+        loop = asyncio.get_running_loop()
+        timeout = self._timeout_for(tool)
+        started = asyncio.Event()
+        future = self._submit(
+            tool,
+            functools.partial(tool, *args, **kwargs),
+            lambda: loop.call_soon_threadsafe(started.set)
+        )
+        if future is None:
+            return self._busy_response(tool)
+        try:
+            await asyncio.wait_for(started.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            # cancel() only succeeds while the call is still queued
+            if future.cancel():
+                return self._busy_response(tool)
+            await started.wait()
+
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            return self._timeout_response(tool)
+        except Exception as e:
+            return self._error_response(tool, e)
+
+        self._set_cached(key, tool, result)
+        return result
+
+    def to_function_tool(self, tool: BaseTool) -> FunctionTool:
+        """
+        Wrap a registered tool in a llama_index FunctionTool that runs through the registry.
+
+        Args:
+            tool: The registered tool.
+
+        Returns:
+            FunctionTool with both sync and async entry points.
+        """
+        # functools.wraps keeps the tool's signature so llama_index builds the right argument schema
+        @functools.wraps(tool.__call__)
+        def fn(*args, **kwargs) -> str:
+            return self.run(tool.name, *args, **kwargs)
+
+        @functools.wraps(tool.__call__)
+        async def async_fn(*args, **kwargs) -> str:
+            return await self.arun(tool.name, *args, **kwargs)
+
+        return FunctionTool.from_defaults(
+            name=tool.name,
+            description=tool.description,
+            fn=fn,
+            async_fn=async_fn
+        )
+
+    def get_function_tools(self) -> List[FunctionTool]:
+        """
+        Return FunctionTool wrappers for all registered tools.
+
+        Returns:
+            List of llama_index FunctionTool objects.
+        """
+        return [self.to_function_tool(tool) for tool in self._tools.values()]
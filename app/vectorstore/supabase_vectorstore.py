@@ -9,15 +9,16 @@ logger = logging.getLogger(__name__)
 class SupabaseVectorStore:
     """Interface to Supabase vector store for FAQ embeddings."""
     
-    def __init__(self, auth: str = None):
+    def __init__(self, auth: str = None, client=None):
         """
         Initialize the vector store.
         
         Args:
             auth: Optional auth token for authenticated requests.
+            client: Optional pre-built Supabase client to use instead of creating one.
         """
         self.auth = auth
-        self.client = get_supabase_client(self.auth)
+        self.client = client if client is not None else get_supabase_client(self.auth)
         
     def create_table_if_not_exists(self, table_name: str = "pho24_faq_embeddings"):
         """
@@ -69,7 +70,8 @@ class SupabaseVectorStore:
             
         return document_ids
         
-    def similarity_search(self, query_embedding: List[float], limit: int = 5, table_name: str = "pho24_faq_embeddings"):
+    def similarity_search(self, query_embedding: List[float], limit: int = 5, table_name: str = "pho24_faq_embeddings",
+                          raise_errors: bool = False, match_threshold: float = 0.5):
         """
         Perform a similarity search using the query embedding.
         
@@ -77,6 +79,8 @@ class SupabaseVectorStore:
             query_embedding: The embedding for the query.
             limit: Maximum number of results to return.
             table_name: The name of the table to search in.
+            raise_errors: If True, re-raise search errors instead of returning an empty list.
+            match_threshold: Minimum similarity for a document to be returned.
             
         Returns:
             List of matching documents.
@@ -88,7 +92,7 @@ class SupabaseVectorStore:
                 "match_documents",
                 {
                     "query_embedding": query_embedding,
-                    "match_threshold": 0.5,
+                    "match_threshold": match_threshold,
                     "match_count": limit
                 }
             ).execute()
@@ -97,4 +101,6 @@ class SupabaseVectorStore:
             
         except Exception as e:
             logger.error(f"Error performing similarity search: {e}")
+            if raise_errors:
+                raise
             return [] 
\ No newline at end of file
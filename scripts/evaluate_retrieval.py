@@ -0,0 +1,171 @@
+"""
+Offline retrieval-quality and latency evaluation over a golden question set.
+
+Runs each golden question against the retrieval backends and reports recall@k,
+MRR, tokens per context and per-query latency. Results are written as JSON so
+runs with different match counts, thresholds, embedding models or chunking can be diffed.
+
+Usage:
+    # Offline, from a cached embedding snapshot
+    python scripts/evaluate_retrieval.py data/eval/golden_set.json
+
+    # Online against Supabase, caching new query embeddings and each RPC's chunks into the snapshot
+    python scripts/evaluate_retrieval.py data/eval/golden_set.json --online \
+        --chunks-table semantic_search_pho24=pho24_chunks --chunks-table match_documents=pho24_faq_embeddings
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Allow running as `python scripts/evaluate_retrieval.py` from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config.env_config import config
+from app.services.embeddings import CachedEmbeddingService
+from app.evaluation.retrieval_backends import RETRIEVAL_BACKENDS, SnapshotVectorIndex, SnapshotRpcClient
+from app.evaluation.retrieval_evaluator import (
+    RetrievalEvaluator,
+    get_token_counter,
+    load_golden_set,
+    write_results,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Evaluate PHO24 retrieval quality and latency.")
+    parser.add_argument("golden_set", help="Path to the golden question set JSON file")
+    parser.add_argument("--snapshot", default=None,
+                        help="Embedding snapshot path (default: data/eval/embeddings_<EMBEDDING_MODEL>.json)")
+    parser.add_argument("--backends", nargs="+", default=list(RETRIEVAL_BACKENDS),
+                        choices=list(RETRIEVAL_BACKENDS), help="Retrieval backends to evaluate")
+    parser.add_argument("--k", nargs="+", type=int, default=[1, 3, 5],
+                        help="Cut-offs for recall@k; retrieval uses the largest as match_count")
+    parser.add_argument("--match-threshold", type=float, default=None,
+                        help="Minimum similarity passed to every backend (default: each backend's own default)")
+    parser.add_argument("--output", default=None,
+                        help="Results path (default: eval_results/retrieval_<EMBEDDING_MODEL>.json)")
+    parser.add_argument("--online", action="store_true",
+                        help="Query Supabase and OpenAI, saving new embeddings to the snapshot")
+    parser.add_argument("--chunks-table", action="append", default=[], metavar="RPC=TABLE",
+                        help="With --online, refresh the snapshot chunks served by RPC from this Supabase table "
+                             "(repeat for each RPC)")
+    return parser.parse_args()
+
+
+def fetch_chunks(supabase, table_name: str, page_size: int = 1000):
+    """
+    Fetch chunk ids, texts and embeddings from a Supabase table for the snapshot.
+
+    Pages through the table because PostgREST caps each response at its max-rows limit.
+
+    Args:
+        supabase: Supabase client.
+        table_name: The table holding the chunk embeddings.
+        page_size: Number of rows requested per page; keep it at or below the max-rows limit.
+
+    Returns:
+        List of snapshot chunks.
+    """
+    rows = []
+    while True:
+        response = (
+            supabase.table(table_name)
+            .select("*")
+            .order("id")
+            .range(len(rows), len(rows) + page_size - 1)
+            .execute()
+        )
+        page = response.data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            break
+
+    logger.info(f"Fetched {len(rows)} chunks from {table_name}")
+    return [
+        {
+            "id": row.get("id"),
+            "text": row.get("text") or row.get("content", ""),
+            "metadata": row.get("metadata", {}),
+            "embedding": row.get("embedding"),
+        }
+        for row in rows
+    ]
+
+
+def main():
+    """Run the evaluation."""
+    logging.basicConfig(
+        level=logging.DEBUG if config.debug else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    args = parse_args()
+
+    snapshot_path = args.snapshot or os.path.join("data", "eval", f"embeddings_{config.embedding_model}.json")
+    output_path = args.output or os.path.join("eval_results", f"retrieval_{config.embedding_model}.json")
+
+    # Pin the configured model so a snapshot built with a different model is rejected
+    embedding_service = CachedEmbeddingService(snapshot_path, offline=not args.online,
+                                               model=config.embedding_model)
+
+    if args.online:
+        from app.config.supabase_config import get_supabase_client
+        supabase = get_supabase_client()
+        for mapping in args.chunks_table:
+            rpc_name, _, table_name = mapping.partition("=")
+            if not table_name:
+                logger.error(f"--chunks-table expects RPC=TABLE, got '{mapping}'")
+                return 1
+            embedding_service.snapshot["chunks"][rpc_name] = fetch_chunks(supabase, table_name)
+    else:
+        snapshot_chunks = embedding_service.snapshot["chunks"]
+        for name in args.backends:
+            rpc_name = RETRIEVAL_BACKENDS[name].rpc_name
+            if not snapshot_chunks.get(rpc_name):
+                logger.error(f"Snapshot {snapshot_path} has no chunks for {rpc_name} (backend {name}); "
+                             f"record them with --online --chunks-table {rpc_name}=<table>")
+                return 1
+        supabase = SnapshotRpcClient({
+            rpc_name: SnapshotVectorIndex(chunks) for rpc_name, chunks in snapshot_chunks.items()
+        })
+
+    golden_set = load_golden_set(args.golden_set)
+    evaluator = RetrievalEvaluator(golden_set, args.k, get_token_counter(config.llm_model))
+    backends = [
+        RETRIEVAL_BACKENDS[name](embedding_service, supabase, match_threshold=args.match_threshold)
+        for name in args.backends
+    ]
+
+    results = evaluator.run(backends, run_info={
+        "golden_set": args.golden_set,
+        "snapshot": snapshot_path,
+        "embedding_model": embedding_service.model,
+        "llm_model": config.llm_model,
+        "offline": not args.online,
+        "match_threshold": args.match_threshold,
+    })
+    results["run"]["snapshot_misses"] = embedding_service.misses
+
+    if args.online:
+        embedding_service.save()
+        logger.info(f"Saved embedding snapshot to {snapshot_path}")
+
+    write_results(results, output_path)
+    logger.info(f"Wrote results to {output_path}")
+
+    for name, backend_results in results["backends"].items():
+        summary = backend_results["summary"]
+        recall = " ".join(f"R@{k}={value:.3f}" for k, value in summary.get("recall", {}).items())
+        print(f"{name}: {recall} MRR={summary.get('mrr', 0):.3f} "
+              f"tokens={summary.get('context_tokens', {}).get('mean', 0)} "
+              f"p50={summary.get('latency_ms', {}).get('p50', 0)}ms "
+              f"p95={summary.get('latency_ms', {}).get('p95', 0)}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.tools.base_tool import BaseTool
+from app.tools.tool_registry import ToolRegistry
+
+
+class SleepTool(BaseTool):
+    """Returns after a short sleep and counts its calls."""
+
+    def __init__(self):
+        super().__init__(name="Sleep", description="Sleeps briefly.", timeout=1.0, max_concurrency=4)
+        self.calls = 0
+
+    def __call__(self, query: str) -> str:
+        self.calls += 1
+        time.sleep(0.2)
+        return f"slept:{query}"
+
+
+class HangTool(BaseTool):
+    """Blocks until released, so calls time out while still holding their slot."""
+
+    def __init__(self):
+        super().__init__(name="Hang", description="Hangs until released.", timeout=0.2, max_concurrency=1)
+        self.release = threading.Event()
+        self.calls = 0
+
+    def __call__(self, query: str) -> str:
+        self.calls += 1
+        self.release.wait()
+        return f"done:{query}"
+
+
+class RaiseTool(BaseTool):
+    """Always raises."""
+
+    def __init__(self):
+        super().__init__(name="Raise", description="Always fails.", timeout=1.0)
+        self.calls = 0
+
+    def __call__(self, query: str) -> str:
+        self.calls += 1
+        raise RuntimeError("backend down")
+
+
+@pytest.fixture
+def registry():
+    registry = ToolRegistry(client_factories={}, max_workers=8)
+    tools = [registry.register(tool) for tool in (SleepTool(), HangTool(), RaiseTool())]
+    yield registry
+    # Let hanging calls finish so worker threads do not outlive the test
+    tools[1].release.set()
+
+
+def _tool(registry, name):
+    return next(tool for tool in registry.tools if tool.name == name)
+
+
+def test_gathered_calls_run_concurrently(registry):
+    async def run_all():
+        return await asyncio.gather(*[registry.arun("Sleep", f"q{i}") for i in range(4)])
+
+    start = time.perf_counter()
+    results = asyncio.run(run_all())
+    elapsed = time.perf_counter() - start
+
+    assert results == [f"slept:q{i}" for i in range(4)]
+    # Four 0.2s calls take about as long as one when they run concurrently
+    assert elapsed < 0.4
+
+
+def test_busy_when_max_concurrency_in_flight(registry):
+    first = registry.run("Hang", "a")
+    assert "took too long" in first
+
+    # The timed-out call still holds the only slot, so the next call is rejected at once
+    start = time.perf_counter()
+    second = registry.run("Hang", "b")
+    assert "busy" in second
+    assert time.perf_counter() - start < 0.1
+    assert _tool(registry, "Hang").calls == 1
+
+
+def test_timed_out_call_is_not_cached(registry):
+    hang = _tool(registry, "Hang")
+    assert "took too long" in registry.run("Hang", "a")
+
+    hang.release.set()
+    # Retry while the timed-out call finishes and frees its slot; busy responses do not run the tool
+    deadline = time.monotonic() + 1.0
+    result = registry.run("Hang", "a")
+    while "busy" in result and time.monotonic() < deadline:
+        time.sleep(0.01)
+        result = registry.run("Hang", "a")
+
+    assert result == "done:a"
+    assert hang.calls == 2
+
+
+def test_identical_call_served_from_cache(registry):
+    sleep = _tool(registry, "Sleep")
+    assert registry.run("Sleep", "menu") == "slept:menu"
+
+    start = time.perf_counter()
+    assert asyncio.run(registry.arun("Sleep", query="menu")) == "slept:menu"
+    assert time.perf_counter() - start < 0.1
+    assert sleep.calls == 1
+
+
+def test_errors_return_fallback_and_are_not_cached(registry):
+    raising = _tool(registry, "Raise")
+    assert "unavailable" in registry.run("Raise", "x")
+    assert "unavailable" in registry.run("Raise", "x")
+    assert raising.calls == 2